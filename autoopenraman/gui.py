@@ -1,4 +1,5 @@
 import json
+import logging
 import sys
 import time
 from copy import deepcopy
@@ -26,7 +27,7 @@ from PyQt5.QtWidgets import (
     QWidget,
 )
 from pyqtgraph import PlotWidget
-from scipy.signal import medfilt
+from scipy.ndimage import median_filter
 
 from autoopenraman import config_profile
 from autoopenraman.calibration import DEFAULT_EXCITATION_WAVELENGTH_NM, RamanCalibrator
@@ -36,10 +37,38 @@ from autoopenraman.utils import (
     write_spectrum,
 )
 
+logger = logging.getLogger(__name__)
+
+# Backoff applied by the live-mode worker after consecutive snap errors
+# (e.g. when the camera is disconnected), doubling from the base up to the max.
+SNAP_ERROR_BACKOFF_BASE_MS = 50
+SNAP_ERROR_BACKOFF_MAX_MS = 1000
+
+# Minimum time between forced GUI refreshes while plotting acquisition spectra
+ACQ_PLOT_REFRESH_INTERVAL_S = 0.05
+
+
+def _to_plot_array(values) -> np.ndarray:
+    """Convert data to a contiguous float32 array before handing it to pyqtgraph.
+
+    float32 gives ample precision for display and halves the data copied into Qt.
+    """
+    return np.ascontiguousarray(values, dtype=np.float32)
+
+
+def _median_filter(spectrum: np.ndarray, kernel_size: int) -> np.ndarray:
+    """Median filter a 1D spectrum, zero-padding the edges like scipy.signal.medfilt.
+
+    scipy.ndimage.median_filter runs the sliding window in C and is much faster than medfilt.
+    """
+    if kernel_size < 1 or kernel_size % 2 == 0:
+        raise ValueError(f"Kernel size must be a positive odd integer, got {kernel_size}.")
+    return median_filter(spectrum, size=kernel_size, mode="constant", cval=0.0)
+
 
 # Worker Thread for Image Acquisition (used in Live Mode)
 class CameraWorker(QThread):
-    data_acquired = pyqtSignal(np.ndarray)  # Signal to emit spectrum data
+    data_acquired = pyqtSignal(int, np.ndarray)  # Signal to emit frame id and spectrum data
 
     def __init__(self):
         super().__init__()
@@ -47,8 +76,10 @@ class CameraWorker(QThread):
         self.running = True
         self.pause_acquisition = False
         self.last_spectrum = None  # Store the last acquired spectrum
+        self.frame_id = 0  # Id of the most recently emitted frame
 
     def run(self):
+        consecutive_errors = 0
         while self.running:
             # Check if acquisition is paused (for background capture)
             if self.pause_acquisition:
@@ -57,25 +88,43 @@ class CameraWorker(QThread):
                 continue
 
             try:
-                # Acquire image
-                self._core.snap_image()  # type: ignore
-                tagged_image = self._core.get_tagged_image()  # type: ignore
-                image_2d = np.reshape(
-                    tagged_image.pix,
-                    newshape=[-1, tagged_image.tags["Height"], tagged_image.tags["Width"]],
-                )
-                spectrum = image_to_spectrum(image_2d)
-
-                # Convert to float64 to allow for negative values after background subtraction
-                spectrum = spectrum.astype(np.float64)
+                spectrum = self._process(self._snap())
 
-                # Store the spectrum for potential background capture
-                self.last_spectrum = spectrum.copy()
+                # Store the spectrum for potential background capture. No copy is needed since
+                # the spectrum is freshly allocated and never modified in place downstream
+                self.last_spectrum = spectrum
 
                 # Emit the spectrum to be displayed
-                self.data_acquired.emit(spectrum)
+                self.frame_id += 1
+                self.data_acquired.emit(self.frame_id, spectrum)
+                consecutive_errors = 0
             except Exception as e:
                 print(f"Error snapping image: {e}")
+                # Back off before retrying so a disconnected camera doesn't spin the CPU
+                self.msleep(
+                    min(
+                        SNAP_ERROR_BACKOFF_MAX_MS,
+                        SNAP_ERROR_BACKOFF_BASE_MS * 2**consecutive_errors,
+                    )
+                )
+                consecutive_errors = min(consecutive_errors + 1, 5)
+
+    def _snap(self):
+        """Snap an image and return the tagged image (blocks for the exposure)."""
+        self._core.snap_image()  # type: ignore
+        return self._core.get_tagged_image()  # type: ignore
+
+    def _process(self, tagged_image) -> np.ndarray:
+        """Reduce a tagged image to a spectrum."""
+        image_2d = np.reshape(
+            tagged_image.pix,
+            newshape=[-1, tagged_image.tags["Height"], tagged_image.tags["Width"]],
+        )
+        spectrum = image_to_spectrum(image_2d)
+
+        # Ensure float64 to allow for negative values after background subtraction;
+        # image_to_spectrum already returns float64 for integer images, so this rarely copies
+        return spectrum.astype(np.float64, copy=False)
 
     def stop(self):
         self.running = False
@@ -111,11 +160,14 @@ class AutoOpenRamanGUI(QMainWindow):
         self.xy_positions = None
         self.labels = None
         self.spectrum_list = []
+        self._last_acq_refresh_s = 0.0  # Time of the last forced acquisition plot refresh
 
         # Initialize calibration variables
         self.calibrator = RamanCalibrator()
         self.calibration_active = False
         self.x_axis_mode = "pixels"  # Can be "pixels" or "wavenumbers"
+        self._x_values = None  # Cached x-axis values for plotting
+        self._x_values_key = None  # (n_points, use_wavenumbers) the cache was built for
 
         # Create the mode selection buttons at the top
         self.create_mode_selector()
@@ -171,6 +223,8 @@ class AutoOpenRamanGUI(QMainWindow):
         self.plot_widget = PlotWidget()
         self.plot_widget.setLabel("left", "Intensity")
         self.plot_widget.setLabel("bottom", "Pixels")
+        self._x_axis_label = "Pixels"
+        self._plot_title = None
 
         # Initialize the main plot line (colors will be set in reset_plot_area)
         self.plot = self.plot_widget.plot()
@@ -265,7 +319,7 @@ class AutoOpenRamanGUI(QMainWindow):
                 plot_title = "Live Mode - Spectrum"
 
             self.plot = self.plot_widget.plot(pen=plot_color)
-            self.plot_widget.setTitle(plot_title)
+            self._set_plot_title(plot_title)
 
             # Hide current spectrum plot if it exists
             if hasattr(self, "current_spectrum_plot"):
@@ -279,7 +333,41 @@ class AutoOpenRamanGUI(QMainWindow):
             self.current_spectrum_plot = self.plot_widget.plot(pen="r")
             self.current_spectrum_plot.setVisible(self.show_current_check.isChecked())
 
-            self.plot_widget.setTitle("Acquisition Mode - Ready")
+            self._set_plot_title("Acquisition Mode - Ready")
+
+    def _set_x_axis_label(self, label):
+        """Set the x-axis label, skipping the axis re-layout if it is unchanged."""
+        if label != self._x_axis_label:
+            self.plot_widget.setLabel("bottom", label)
+            self._x_axis_label = label
+
+    def _get_x_values(self, n_points):
+        """Return the x-axis values for a spectrum of n_points and update the x-axis label.
+
+        The values are cached and only recomputed when the spectrum length, the x-axis mode
+        or the calibration changes.
+        """
+        use_wavenumbers = self.x_axis_mode == "wavenumbers" and self.calibration_active
+        if use_wavenumbers:
+            self._set_x_axis_label("Wavenumber (cm⁻¹)")
+        else:
+            self._set_x_axis_label("Pixels")
+
+        key = (n_points, use_wavenumbers)
+        if key != self._x_values_key:
+            pixels = np.arange(n_points)
+            x_values = self.calibrator.apply_calibration(pixels) if use_wavenumbers else pixels
+            self._x_values = _to_plot_array(x_values)
+            # The same array is handed to every plot update, so guard it against in-place edits
+            self._x_values.setflags(write=False)
+            self._x_values_key = key
+        return self._x_values
+
+    def _set_plot_title(self, title):
+        """Set the plot title, skipping the title re-layout if it is unchanged."""
+        if title != self._plot_title:
+            self.plot_widget.setTitle(title)
+            self._plot_title = title
 
     def switch_mode(self, index):
         """Switch between different modes (Live or Acquisition)"""
@@ -455,7 +543,7 @@ class AutoOpenRamanGUI(QMainWindow):
         """Start the worker thread for live acquisition."""
         print("Starting live acquisition...")
         self.worker = CameraWorker()
-        self.worker.data_acquired.connect(self.update_live_plot)
+        self.worker.data_acquired.connect(self.on_live_frame)
         self.worker.start()
 
         self.start_live_btn.setEnabled(False)
@@ -528,6 +616,14 @@ class AutoOpenRamanGUI(QMainWindow):
 
         print("Background cleared and subtraction disabled")
 
+    def on_live_frame(self, frame_id, spectrum):
+        """Draw a live frame, unless a newer frame is already queued behind it."""
+        # When the worker outruns the GUI, frames pile up in the event queue;
+        # only the most recent one is worth drawing
+        if self.worker is not None and frame_id < self.worker.frame_id:
+            return
+        self.update_live_plot(spectrum)
+
     def update_live_plot(self, spectrum):
         """Update the live plot with new spectrum data."""
         # Apply background subtraction if active
@@ -553,26 +649,17 @@ class AutoOpenRamanGUI(QMainWindow):
             plot_title = "Live Mode - Spectrum"
             plot_color = "b"  # Blue for regular data
 
-        # Create the x_data array
-        if self.x_axis_mode == "wavenumbers" and self.calibration_active:
-            # Use calibrated wavenumbers for the x-axis
-            x_data = self.calibrator.apply_calibration(np.arange(len(processed_spectrum)))
-            # Update x-axis label
-            self.plot_widget.setLabel("bottom", "Wavenumber (cm⁻¹)")
-        else:
-            # Use pixel indices for the x-axis
-            x_data = np.arange(len(processed_spectrum))
-            # Update x-axis label
-            self.plot_widget.setLabel("bottom", "Pixels")
+        # Get the x_data array
+        x_data = self._get_x_values(len(processed_spectrum))
 
         # Set pen color based on whether background subtraction is active
         self.plot.setPen(plot_color)
 
         # Update the plot with processed data
-        self.plot.setData(x_data, processed_spectrum)
+        self.plot.setData(x_data, _to_plot_array(processed_spectrum))
 
         # Update title
-        self.plot_widget.setTitle(plot_title)
+        self._set_plot_title(plot_title)
 
     def process_spectrum(self, spectrum):
         """Apply common processing to spectrum data based on filter settings."""
@@ -582,10 +669,10 @@ class AutoOpenRamanGUI(QMainWindow):
         if self.apply_median_filter:
             try:
                 kernel_size = int(self.kernel_size_input.text())
-                processed_spectrum = medfilt(processed_spectrum, kernel_size=kernel_size)
+                processed_spectrum = _median_filter(processed_spectrum, kernel_size)
             except ValueError:
                 print("Invalid kernel size. Using default of 3.")
-                processed_spectrum = medfilt(processed_spectrum, kernel_size=3)
+                processed_spectrum = _median_filter(processed_spectrum, 3)
 
         # Reverse X if enabled
         if self.reverse_x:
@@ -636,7 +723,7 @@ class AutoOpenRamanGUI(QMainWindow):
         if not exp_path.is_dir():
             print(f"Creating save directory: {exp_path}")
             exp_path.mkdir(parents=True)
-        elif len(list(exp_path.glob("*.csv"))) > 0:
+        elif next(exp_path.glob("*.csv"), None) is not None:
             # In a GUI, we should show a dialog here
             print(f"Warning: {exp_path} is not empty. Files may be overwritten.")
 
@@ -672,26 +759,17 @@ class AutoOpenRamanGUI(QMainWindow):
         self.acquisition_worker.spectrum_ready.connect(self.update_acq_plot)
         self.acquisition_thread.start()
 
-    def update_acq_plot(self, x, current_spectrum, running_avg, title):
+    def update_acq_plot(self, x, current_spectrum, running_avg, title, is_final=False):
         """Update the acquisition plot showing both current spectrum and running average"""
         # Process spectra
         processed_current = self.process_spectrum(current_spectrum)
         processed_avg = self.process_spectrum(running_avg)
 
-        # Create x values based on the current mode
-        if self.x_axis_mode == "wavenumbers" and self.calibration_active:
-            # Use calibrated wavenumbers for the x-axis
-            x_values = self.calibrator.apply_calibration(np.arange(len(processed_avg)))
-            # Update x-axis label
-            self.plot_widget.setLabel("bottom", "Wavenumber (cm⁻¹)")
-        else:
-            # Use pixel indices for the x-axis
-            x_values = np.arange(len(processed_avg))
-            # Update x-axis label
-            self.plot_widget.setLabel("bottom", "Pixels")
+        # Get x values based on the current mode
+        x_values = self._get_x_values(len(processed_avg))
 
         # Update running average plot (blue)
-        self.plot.setData(x_values, processed_avg)
+        self.plot.setData(x_values, _to_plot_array(processed_avg))
 
         # Check if we need to recreate the current spectrum plot
         if self.show_current_check.isChecked():
@@ -700,7 +778,7 @@ class AutoOpenRamanGUI(QMainWindow):
                 self.current_spectrum_plot = self.plot_widget.plot(pen="r")
 
             # Update the current spectrum data
-            self.current_spectrum_plot.setData(x_values, processed_current)
+            self.current_spectrum_plot.setData(x_values, _to_plot_array(processed_current))
             self.current_spectrum_plot.setVisible(True)
 
             # Title with both plots indicated
@@ -714,10 +792,16 @@ class AutoOpenRamanGUI(QMainWindow):
             full_title = f"{title} (Running Average)"
 
         # Update the plot title
-        self.plot_widget.setTitle(full_title)
+        self._set_plot_title(full_title)
 
-        # Make sure the GUI refreshes to show the new data immediately
-        QApplication.processEvents()
+        # Make sure the GUI refreshes to show the new data, coalescing refreshes
+        # that arrive faster than the refresh interval. The final spectrum of an average
+        # is always shown, because the acquisition may then wait for the whole time
+        # interval before the next spectrum arrives
+        now = time.monotonic()
+        if is_final or now - self._last_acq_refresh_s >= ACQ_PLOT_REFRESH_INTERVAL_S:
+            QApplication.processEvents()
+            self._last_acq_refresh_s = now
 
     def change_x_axis_mode(self, index):
         """Change the x-axis mode (pixels or wavenumbers)."""
@@ -752,6 +836,10 @@ class AutoOpenRamanGUI(QMainWindow):
         """Open the calibration dialog to perform calibration."""
         dialog = CalibrationDialog(self)
         if dialog.exec_() == QDialog.Accepted:
+            # The dialog may have changed the excitation wavelength, so recompute the cached
+            # wavenumbers on the next plot update
+            self._x_values_key = None
+
             # Get the neon and acetonitrile spectra from the dialog
             neon_spectrum = dialog.neon_spectrum
             acetonitrile_spectrum = dialog.acetonitrile_spectrum
@@ -811,6 +899,7 @@ class AutoOpenRamanGUI(QMainWindow):
         else:
             self.calibrator.load_calibration(Path(file_path))
             self.calibration_active = True
+            self._x_values_key = None  # Recompute the cached wavenumbers
             self.save_calibration_btn.setEnabled(True)
 
             # Update the plot if in wavenumber mode
@@ -1018,8 +1107,8 @@ class CalibrationDialog(QDialog):
 # Worker for Acquisition Mode
 class AcquisitionWorker(QThread):
     finished = pyqtSignal()
-    spectrum_ready = pyqtSignal(object, object, object, str)
-    # x, current_spectrum, running_avg, title
+    spectrum_ready = pyqtSignal(object, object, object, str, bool)
+    # x, current_spectrum, running_avg, title, is_final
 
     def __init__(
         self,
@@ -1050,8 +1139,34 @@ class AcquisitionWorker(QThread):
         # Get the parent window (GUI) to access calibration information
         self.parent_window = parent
 
-        # List to store spectra for the current position
-        self.spectrum_list = []
+        # Look up the calibration once so every position in the run is saved in the same
+        # format, rather than re-querying the parent window for every saved spectrum
+        if parent is not None and getattr(parent, "calibration_active", False):
+            self.calibrator = parent.calibrator
+        else:
+            self.calibrator = None
+
+        # The acquisition and processing parameters are fixed for the whole run,
+        # so build their metadata entries once instead of for every saved position
+        self.acquisition_metadata = {
+            "Number of averages": self.n_averages,
+            "Stage position file": self.position_file,
+            "Timelapse": {
+                "NumTimePoints": self.num_time_points,
+                "TimeIntervalSeconds": self.time_interval_s,
+            },
+            "Processing": {
+                "MedianFilter": {
+                    "Applied": self.apply_median_filter,
+                    "KernelSize": self.kernel_size,
+                },
+                "ReverseX": self.reverse_x,
+            },
+        }
+
+        # Running sum and count of the spectra acquired at the current position
+        self.spectrum_sum = None
+        self.spectrum_count = 0
 
         # Flag to control whether to show latest individual spectrum alongside the average
         self.show_latest = True
@@ -1096,37 +1211,24 @@ class AcquisitionWorker(QThread):
 
     def _save_metadata(self, _filename: str, _metadata: dict) -> None:
         """Save the metadata to a JSON file."""
-        # add the acquisition parameters to the metadata
-        _metadata["Number of averages"] = self.n_averages
-        _metadata["Stage position file"] = self.position_file
-        _metadata["DateTime"] = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
-        _metadata["Timelapse"] = {
-            "NumTimePoints": self.num_time_points,
-            "TimeIntervalSeconds": self.time_interval_s,
-        }
-
-        # Add processing parameters
-        _metadata["Processing"] = {
-            "MedianFilter": {"Applied": self.apply_median_filter, "KernelSize": self.kernel_size},
-            "ReverseX": self.reverse_x,
-        }
+        # add the acquisition and processing parameters to the metadata
+        _metadata.update(self.acquisition_metadata)
+        _metadata["DateTime"] = time.strftime("%Y-%m-%d %H:%M:%S")
 
         # Add calibration information if not already present
         if "Calibration" not in _metadata:
-            if (
-                self.parent_window is not None
-                and hasattr(self.parent_window, "calibration_active")
-                and self.parent_window.calibration_active
-            ):
+            if self.calibrator is not None:
                 _metadata["Calibration"] = {
                     "Applied": True,
-                    "ExcitationWavelength": self.parent_window.calibrator.excitation_wavelength_nm,
+                    "ExcitationWavelength": self.calibrator.excitation_wavelength_nm,
                 }
             else:
                 _metadata["Calibration"] = {"Applied": False}
 
-        with open(self.exp_path / (_filename + ".json"), "w") as f:
-            json.dump(_metadata, f)
+        # Serialize up front so the file is written in one call rather than streamed in chunks
+        (self.exp_path / (_filename + ".json")).write_text(
+            json.dumps(_metadata, separators=(",", ":"))
+        )
 
     def process_image(self, image: np.ndarray, metadata: dict) -> None:
         """Process the acquired image."""
@@ -1140,30 +1242,36 @@ class AcquisitionWorker(QThread):
         # Create x-axis values as pixel indices
         x = np.arange(len(img_spectrum))
 
-        # Add the new spectrum to our list
-        self.spectrum_list.append(img_spectrum)
-        current_count = len(self.spectrum_list)
+        # Add the new spectrum to the running sum
+        if self.spectrum_count == 0 or self.spectrum_sum is None:
+            self.spectrum_sum = img_spectrum.astype(np.float64)
+        elif self.spectrum_sum.shape != img_spectrum.shape:
+            raise ValueError(
+                f"Spectrum shape changed from {self.spectrum_sum.shape} to "
+                f"{img_spectrum.shape} partway through an average"
+            )
+        else:
+            self.spectrum_sum += img_spectrum
+        self.spectrum_count += 1
+        current_count = self.spectrum_count
 
         # Calculate running average
-        running_avg = np.mean(self.spectrum_list, axis=0)
+        running_avg = self.spectrum_sum / current_count
 
         # Create a more detailed title showing acquisition progress
         title = f"Position: {fname} - Spectrum {current_count}/{self.n_averages}"
 
         # Emit both the current spectrum and the running average
         # This allows the GUI to show both if desired
-        self.spectrum_ready.emit(x, img_spectrum, running_avg, title)
+        is_final = current_count == self.n_averages
+        self.spectrum_ready.emit(x, img_spectrum, running_avg, title, is_final)
 
         # If this was the final spectrum in the average, save data and reset for next position
-        if current_count == self.n_averages:
-            # Check if calibration is active and parent exists
-            if (
-                self.parent_window is not None
-                and hasattr(self.parent_window, "calibration_active")
-                and self.parent_window.calibration_active
-            ):
+        if is_final:
+            # Check if calibration is active
+            if self.calibrator is not None:
                 # Apply calibration to get wavenumbers
-                wavenumbers = self.parent_window.calibrator.apply_calibration(x)
+                wavenumbers = self.calibrator.apply_calibration(x)
 
                 # Save with calibrated wavenumbers (3-column format)
                 write_spectrum(
@@ -1176,7 +1284,7 @@ class AcquisitionWorker(QThread):
                 # Add calibration info to metadata
                 metadata["Calibration"] = {
                     "Applied": True,
-                    "ExcitationWavelength": self.parent_window.calibrator.excitation_wavelength_nm,
+                    "ExcitationWavelength": self.calibrator.excitation_wavelength_nm,
                 }
             else:
                 # Save without calibration (2-column format)
@@ -1192,8 +1300,8 @@ class AcquisitionWorker(QThread):
             # Save metadata
             self._save_metadata(fname, metadata)
 
-            # Clear the spectrum list for the next position
-            self.spectrum_list = []
+            # Reset the running sum for the next position
+            self.spectrum_count = 0
 
     def run_acquisition(self) -> None:
         """Run the acquisition."""
@@ -1206,16 +1314,14 @@ class AcquisitionWorker(QThread):
                 position_labels=self.labels,  # type: ignore
                 order="pt",
             )
-            print("Event stack:")
-            print(event_stack)
+            logger.debug("Event stack: %s", event_stack)
             events = []
             for _event in event_stack:  # type: ignore
                 for i in range(self.n_averages):
                     __event = deepcopy(_event)
                     __event["axes"]["avg_index"] = i
                     events.append(__event)
-            print("Events:")
-            print(events)
+            logger.debug("Events: %s", events)
 
             for _, event in enumerate(events):
                 future = acq.acquire(event)
@@ -1224,7 +1330,7 @@ class AcquisitionWorker(QThread):
                     # open shutter before first image series
                     self._set_shutter_open_safe(is_open=True)
 
-                print(f"Acquiring image {event["axes"]["avg_index"] + 1}/{self.n_averages}")
+                print(f"Acquiring image {event['axes']['avg_index'] + 1}/{self.n_averages}")
                 result = future.await_image_saved(None, return_image=True, return_metadata=True)
                 if result is None:
                     print("Error: No image or metadata returned.")
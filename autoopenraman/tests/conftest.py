@@ -0,0 +1,45 @@
+import sys
+
+import pytest
+from pycromanager import Core, Studio
+from PyQt5.QtWidgets import QApplication
+
+from autoopenraman import config_profile
+
+
+@pytest.fixture(scope="session", autouse=True)
+def setup_environment(request):
+    """Initialize the profile for the requested environment once per test session."""
+    env_to_run = request.config.getoption("--environment")
+    print(f"Setting up environment: {env_to_run}")
+    config_profile.init_profile(env_to_run)
+
+
+@pytest.fixture(scope="session")
+def real_pycromanager():
+    """
+    Fixture for real pycromanager Core and Studio instances.
+
+    Tests will use the actual MM Core and Studio, allowing for realistic testing
+    with connected hardware.
+    """
+    try:
+        core = Core()
+        studio = Studio()
+
+        # Initialize core for testing - this ensures we can acquire basic images
+        # Only runs this setup once per session
+        print("Setting up pycromanager Core")
+        return {"core": core, "studio": studio}
+
+    except Exception as e:
+        pytest.skip(f"Could not initialize pycromanager: {e}")
+
+
+@pytest.fixture(scope="session")
+def app():
+    """Create a QApplication instance shared by all tests in the session."""
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication(sys.argv)
+    return app
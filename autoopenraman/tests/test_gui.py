@@ -1,46 +1,13 @@
 import json
-import sys
-import tempfile
+import os
 from pathlib import Path
 from unittest.mock import MagicMock
 
 import numpy as np
 import pytest
-from pycromanager import Core, Studio
-from PyQt5.QtWidgets import QApplication
 
-from autoopenraman import config_profile
 from autoopenraman.gui import AcquisitionWorker, AutoOpenRamanGUI
-
-
-@pytest.fixture(scope="session")
-def real_pycromanager():
-    """
-    Fixture for real pycromanager Core and Studio instances.
-
-    Tests will use the actual MM Core and Studio, allowing for realistic testing
-    with connected hardware.
-    """
-    try:
-        core = Core()
-        studio = Studio()
-
-        # Initialize core for testing - this ensures we can acquire basic images
-        # Only runs this setup once per session
-        print("Setting up pycromanager Core")
-        return {"core": core, "studio": studio}
-
-    except Exception as e:
-        pytest.skip(f"Could not initialize pycromanager: {e}")
-
-
-@pytest.fixture
-def app():
-    """Create a QApplication instance for testing."""
-    app = QApplication.instance()
-    if app is None:
-        app = QApplication(sys.argv)
-    return app
+from autoopenraman.utils import image_to_spectrum
 
 
 @pytest.fixture
@@ -51,25 +18,6 @@ def gui_window(app, real_pycromanager):
     window.close()
 
 
-@pytest.fixture(autouse=True)
-def setup_environment(request, monkeypatch):
-    print("setup_environment")
-    env_to_run = request.config.getoption("--environment")
-    print(f"Setting up environment: {env_to_run}")
-
-    # Create a temporary directory to use as save_dir
-    temp_dir = tempfile.TemporaryDirectory()
-
-    # Initialize the profile
-    config_profile.init_profile(env_to_run)
-
-    # Yield the temp directory to keep it alive during the test
-    yield temp_dir
-
-    # Cleanup
-    temp_dir.cleanup()
-
-
 def _create_mock_position_file(file_path: Path, n_positions: int = 2) -> None:
     """
     Create a mock JSON file with stage positions for testing.
@@ -97,13 +45,39 @@ def _create_mock_position_file(file_path: Path, n_positions: int = 2) -> None:
     }
 
     with open(file_path, "w") as file:
-        json.dump(mock_data, file, indent=4)
+        json.dump(mock_data, file, separators=(",", ":"))
+
+
+@pytest.fixture(scope="session")
+def mock_position_file(tmp_path_factory):
+    """
+    Fixture returning a function that gives the path to a mock position file
+    with the requested number of positions.
+
+    Each file is written once per session and shared by all tests that use it.
+    """
+    position_dir = tmp_path_factory.mktemp("positions")
+    position_files = {}
+
+    def _get_mock_position_file(n_positions: int = 2) -> Path:
+        if n_positions not in position_files:
+            file_path = position_dir / f"positions_{n_positions}.json"
+            _create_mock_position_file(file_path, n_positions=n_positions)
+            position_files[n_positions] = file_path
+        return position_files[n_positions]
+
+    return _get_mock_position_file
 
 
 def _get_n_jsons_and_csvs_in_dir(directory: Path) -> tuple[int, int]:
     """Return the number of JSON and CSV files in the given directory."""
-    n_jsons = len(list(directory.glob("*.json")))
-    n_csvs = len(list(directory.glob("*.csv")))
+    n_jsons = n_csvs = 0
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.endswith(".json"):
+                n_jsons += 1
+            elif entry.name.endswith(".csv"):
+                n_csvs += 1
     return n_jsons, n_csvs
 
 
@@ -279,175 +253,92 @@ def test_background_subtraction(gui_window):
 
 
 # Tests adapted from test_acq.py
-def test_acq_worker_no_args(app, real_pycromanager):
-    """Test acquisition worker with default settings."""
-    # Create a temporary directory for the experiment
-    with tempfile.TemporaryDirectory() as temp_dir:
-        exp_path = Path(temp_dir) / "exp1"
-        exp_path.mkdir()
-
-        # Create acquisition worker with real MM
-        worker = AcquisitionWorker(
-            n_averages=1,
-            exp_path=exp_path,
-            position_file=None,
-            shutter=False,
-            randomize_stage_positions=False,
-        )
-
-        # Run acquisition
-        worker.run_acquisition()
-
-        # Verify the output directory and files
-        assert exp_path.is_dir()
-        n_jsons, n_csvs = _get_n_jsons_and_csvs_in_dir(exp_path)
-        assert n_jsons == 1
-        assert n_csvs == 1
-
-
-def test_acq_worker_with_averaging(app, real_pycromanager):
-    """Test acquisition worker with averaging."""
-    # Create a temporary directory for the experiment
-    with tempfile.TemporaryDirectory() as temp_dir:
-        exp_path = Path(temp_dir) / "exp1"
-        exp_path.mkdir()
-
-        # Create acquisition worker
-        worker = AcquisitionWorker(
-            n_averages=5,
-            exp_path=exp_path,
-            position_file=None,
-            shutter=False,
-            randomize_stage_positions=False,
-        )
-
-        # Run acquisition
-        worker.run_acquisition()
-
-        # Verify the output directory and files
-        assert exp_path.is_dir()
-        n_jsons, n_csvs = _get_n_jsons_and_csvs_in_dir(exp_path)
-        assert n_jsons == 1
-        assert n_csvs == 1
-
-
-def test_acq_worker_with_position_file(app, real_pycromanager):
-    """Test acquisition worker with position file."""
-    # Create a temporary directory for the experiment
-    with tempfile.TemporaryDirectory() as temp_dir:
-        exp_path = Path(temp_dir) / "exp1"
-        exp_path.mkdir()
-
-        # Create a mock position file
-        _n_positions = 5
-        position_file = Path(temp_dir) / "positions.json"
-        _create_mock_position_file(position_file, n_positions=_n_positions)
-
-        # Create acquisition worker
-        worker = AcquisitionWorker(
-            n_averages=2,
-            exp_path=exp_path,
-            position_file=str(position_file),
-            shutter=False,
-            randomize_stage_positions=False,
-        )
-
-        # Run acquisition
-        worker.run_acquisition()
-
-        # Verify the output directory and files
-        assert exp_path.is_dir()
-        n_jsons, n_csvs = _get_n_jsons_and_csvs_in_dir(exp_path)
-        assert n_jsons == _n_positions
-        assert n_csvs == _n_positions
-
-
-def test_acq_worker_with_shutter(app, real_pycromanager):
-    """Test acquisition worker with shutter."""
-    # Create a temporary directory for the experiment
-    with tempfile.TemporaryDirectory() as temp_dir:
-        exp_path = Path(temp_dir) / "exp1"
-        exp_path.mkdir()
-
-        # Create acquisition worker
-        worker = AcquisitionWorker(
-            n_averages=1,
-            exp_path=exp_path,
-            position_file=None,
-            shutter=True,
-            randomize_stage_positions=False,
-        )
-
-        # Run acquisition
-        worker.run_acquisition()
-
-        # Verify the output directory and files
-        assert exp_path.is_dir()
-        n_jsons, n_csvs = _get_n_jsons_and_csvs_in_dir(exp_path)
-        assert n_jsons == 1
-        assert n_csvs == 1
-
-
-def test_acq_worker_with_timelapse(app, real_pycromanager):
-    """Test acquisition worker with timelapse."""
-    # Create a temporary directory for the experiment
-    with tempfile.TemporaryDirectory() as temp_dir:
-        exp_path = Path(temp_dir) / "timelapse"
-        exp_path.mkdir()
-
-        # Create acquisition worker
-        worker = AcquisitionWorker(
-            n_averages=1,
-            exp_path=exp_path,
-            position_file=None,
-            shutter=False,
-            randomize_stage_positions=False,
-            num_time_points=3,
-            time_interval_s=1,  # Short interval for testing
-        )
-
-        # Run acquisition
-        worker.run_acquisition()
-
-        # Verify the output directory exists
-        assert exp_path.is_dir()
-
-        # Should have 3 time points with JSON/CSV pairs
-        n_jsons, n_csvs = _get_n_jsons_and_csvs_in_dir(exp_path)
-        assert n_jsons == 3
-        assert n_csvs == 3
-
-
-def test_acq_worker_with_timelapse_and_position_file(app, real_pycromanager):
-    """Test acquisition worker with timelapse and position file."""
-    # Create a temporary directory for the experiment
-    with tempfile.TemporaryDirectory() as temp_dir:
-        exp_path = Path(temp_dir) / "timelapse_positions"
-        exp_path.mkdir()
-
-        # Create a mock position file
-        _n_positions = 3
-        position_file = Path(temp_dir) / "positions.json"
-        _create_mock_position_file(position_file, n_positions=_n_positions)
-
-        # Create acquisition worker
-        worker = AcquisitionWorker(
-            n_averages=1,
-            exp_path=exp_path,
-            position_file=str(position_file),
-            shutter=False,
-            randomize_stage_positions=False,
-            num_time_points=3,
-            time_interval_s=1,  # Short interval for testing
-        )
-
-        # Run acquisition
-        worker.run_acquisition()
-
-        # Verify the output directory exists
-        assert exp_path.is_dir()
-
-        # Should have 3 time points for each position
-        n_jsons, n_csvs = _get_n_jsons_and_csvs_in_dir(exp_path)
-        assert n_jsons == 9  # 3 positions × 3 time points
-        assert n_csvs == 9
+@pytest.mark.parametrize(
+    "n_averages, shutter, num_time_points, time_interval_s, n_positions, n_expected_files",
+    [
+        pytest.param(1, False, 1, 0, None, 1, id="no_args"),
+        pytest.param(5, False, 1, 0, None, 1, id="with_averaging"),
+        pytest.param(2, False, 1, 0, 5, 5, id="with_position_file"),
+        pytest.param(1, True, 1, 0, None, 1, id="with_shutter"),
+        # Short interval for testing; 3 time points
+        pytest.param(1, False, 3, 1, None, 3, id="with_timelapse"),
+        # 3 positions × 3 time points
+        pytest.param(1, False, 3, 1, 3, 9, id="with_timelapse_and_position_file"),
+    ],
+)
+def test_acq_worker(
+    app,
+    real_pycromanager,
+    tmp_path,
+    mock_position_file,
+    n_averages,
+    shutter,
+    num_time_points,
+    time_interval_s,
+    n_positions,
+    n_expected_files,
+):
+    """Test acquisition worker with real MM across acquisition settings."""
+    exp_path = tmp_path / "exp1"
+    exp_path.mkdir()
+
+    # Get a mock position file if the test case uses one
+    position_file = str(mock_position_file(n_positions)) if n_positions is not None else None
+
+    # Create acquisition worker
+    worker = AcquisitionWorker(
+        n_averages=n_averages,
+        exp_path=exp_path,
+        position_file=position_file,
+        shutter=shutter,
+        randomize_stage_positions=False,
+        num_time_points=num_time_points,
+        time_interval_s=time_interval_s,
+    )
+
+    # Run acquisition
+    worker.run_acquisition()
+
+    # Verify the output directory and files: one JSON/CSV pair per position and time point
+    assert exp_path.is_dir()
+    n_jsons, n_csvs = _get_n_jsons_and_csvs_in_dir(exp_path)
+    assert n_jsons == n_expected_files
+    assert n_csvs == n_expected_files
+
+
+def test_acq_worker_averaging(app, tmp_path):
+    """Test that the saved spectrum of each position is the mean of its acquired spectra."""
+    n_averages = 3
+    worker = AcquisitionWorker(
+        n_averages=n_averages,
+        exp_path=tmp_path,
+        position_file=None,
+        shutter=False,
+        randomize_stage_positions=False,
+    )
+
+    rng = np.random.default_rng(0)
+    for position_name in ["Pos1", "Pos2"]:
+        images = rng.integers(0, 4096, size=(n_averages, 4, 8), dtype=np.uint16)
+        for image in images:
+            worker.process_image(image, {"PositionName": position_name, "Axes": {"time": 0}})
+
+        expected = np.mean([image_to_spectrum(image) for image in images], axis=0)
+        data = np.loadtxt(tmp_path / f"{position_name}_0.csv", delimiter=",", skiprows=1)
+        assert np.array_equal(data[:, 1], expected)
+
+
+def test_acq_worker_averaging_shape_change(app, tmp_path):
+    """Test that a spectrum shape change partway through an average raises."""
+    worker = AcquisitionWorker(
+        n_averages=3,
+        exp_path=tmp_path,
+        position_file=None,
+        shutter=False,
+        randomize_stage_positions=False,
+    )
+    metadata = {"PositionName": "Pos1", "Axes": {"time": 0}}
+
+    worker.process_image(np.ones((4, 8)), metadata)
+    with pytest.raises(ValueError):
+        worker.process_image(np.ones((4, 9)), metadata)
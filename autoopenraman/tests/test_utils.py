@@ -0,0 +1,106 @@
+import json
+
+import numpy as np
+import pytest
+
+from autoopenraman.utils import extract_stage_positions, write_spectrum
+
+
+def test_write_spectrum(tmp_path):
+    """Test that a 2-column spectrum CSV round-trips exactly through np.loadtxt."""
+    file_path = tmp_path / "spectrum.csv"
+    x = np.arange(5)
+    y = np.array([1.5, 1234.5678, 0.1 + 0.2, 0.0, -3.5e-7])
+
+    write_spectrum(file_path, x, y)
+
+    # Only the final CSV should be left behind, not the temporary file it was written to
+    assert list(tmp_path.iterdir()) == [file_path]
+
+    with open(file_path) as file:
+        assert file.readline().strip() == "Pixel,Intensity"
+
+    data = np.loadtxt(file_path, delimiter=",", skiprows=1)
+    assert np.array_equal(data[:, 0], x)
+    assert np.array_equal(data[:, 1], y)
+
+
+def test_write_spectrum_with_wavenumbers(tmp_path):
+    """Test that a 3-column spectrum CSV is written when wavenumbers are provided."""
+    file_path = tmp_path / "spectrum.csv"
+    x = np.arange(3)
+    y = np.array([10.0, 20.0 / 3.0, 30.123456789012345])
+    wavenumbers = np.array([100.5, 200.25 / 7.0, 3000.000000000001])
+
+    write_spectrum(file_path, x, y, wavenumbers=wavenumbers)
+
+    with open(file_path) as file:
+        assert file.readline().strip() == "Pixel,Wavenumber (cm-1),Intensity"
+
+    data = np.loadtxt(file_path, delimiter=",", skiprows=1)
+    assert np.array_equal(data[:, 0], x)
+    assert np.array_equal(data[:, 1], wavenumbers)
+    assert np.array_equal(data[:, 2], y)
+
+
+def test_write_spectrum_length_mismatch(tmp_path):
+    """Test that mismatched x and y lengths raise without writing a file."""
+    file_path = tmp_path / "spectrum.csv"
+
+    with pytest.raises(ValueError):
+        write_spectrum(file_path, np.arange(3), np.ones(4))
+
+    assert not file_path.exists()
+
+
+def _write_position_file(file_path, positions):
+    """Write a Micro-Manager position list JSON file from (label, device positions) pairs."""
+    data = {
+        "map": {
+            "StagePositions": {
+                "array": [
+                    {
+                        "DevicePositions": {
+                            "array": [
+                                {"Position_um": {"array": device_position}}
+                                for device_position in device_positions
+                            ]
+                        },
+                        "Label": {"scalar": label},
+                    }
+                    for label, device_positions in positions
+                ]
+            }
+        }
+    }
+    file_path.write_text(json.dumps(data))
+
+
+def test_extract_stage_positions(tmp_path):
+    """Test that XY coordinates and labels are extracted in file order."""
+    file_path = tmp_path / "positions.json"
+    _write_position_file(
+        file_path,
+        [("Position1", [[10.0, 20.0]]), ("Position2", [[30.0, 40.0]]), ("Position3", [[5.5, 6.5]])],
+    )
+
+    coordinates, labels = extract_stage_positions(file_path)
+
+    assert np.array_equal(coordinates, [[10.0, 20.0], [30.0, 40.0], [5.5, 6.5]])
+    assert labels == ["Position1", "Position2", "Position3"]
+
+
+@pytest.mark.parametrize(
+    "device_positions",
+    [
+        pytest.param([[10.0, 20.0], [5.0]], id="xy_and_z_stage"),
+        pytest.param([[5.0]], id="z_stage_only"),
+    ],
+)
+def test_extract_stage_positions_rejects_non_xy_device(tmp_path, device_positions):
+    """Test that a device position without exactly two coordinates (e.g. a Z stage) raises."""
+    file_path = tmp_path / "positions.json"
+    _write_position_file(file_path, [("Position1", device_positions)])
+
+    with pytest.raises(ValueError):
+        extract_stage_positions(file_path)
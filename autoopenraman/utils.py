@@ -1,5 +1,6 @@
 import csv
 import json
+import os
 from collections.abc import Sequence
 from pathlib import Path
 from typing import Optional
@@ -40,7 +41,7 @@ def write_spectrum(
     Write a CSV file of spectrum data with optional calibration.
 
     Parameters:
-        file_path (str): The name of the file to write to.
+        file_path (Path): The name of the file to write to.
         x (Sequence): An Sequence of pixel indices.
         y (Sequence): An Sequence of intensity values corresponding to each pixel.
         wavenumbers (Sequence, optional): Calibrated wavenumber values. If provided, a 3-column file
@@ -48,12 +49,16 @@ def write_spectrum(
         header (list, optional): A list of header values. Default depends on whether wavenumbers
           are provided.
     """
+    x_arr = np.asarray(x)
+    y_arr = np.asarray(y)
+    wavenumbers_arr = np.asarray(wavenumbers) if wavenumbers is not None else None
+
     # Check if the lengths of the arrays match
-    if len(x) != len(y):
+    if x_arr.shape != y_arr.shape:
         raise ValueError("The length of x and y arrays must be the same.")
 
     # If wavenumbers are provided, ensure the length matches
-    if wavenumbers is not None and len(wavenumbers) != len(x):
+    if wavenumbers_arr is not None and wavenumbers_arr.shape != x_arr.shape:
         raise ValueError("The length of wavenumbers array must match the x array.")
 
     # Set default header based on whether wavenumbers are provided
@@ -63,20 +68,29 @@ def write_spectrum(
         else:
             header = ["Pixel", "Intensity"]
 
-    with open(file_path, mode="w", newline="") as file:
-        writer = csv.writer(file)
-        # Write the header
-        writer.writerow(header)
-
-        # Write the data rows
-        if wavenumbers is not None:
-            # 3-column format with calibration
-            for pixel, wavenumber, intensity in zip(x, wavenumbers, y):
-                writer.writerow([pixel, wavenumber, intensity])
-        else:
-            # 2-column format without calibration
-            for pixel, intensity in zip(x, y):
-                writer.writerow([pixel, intensity])
+    # Convert the columns to Python lists once, so csv.writer writes the exact repr of each value
+    if wavenumbers_arr is not None:
+        # 3-column format with calibration
+        rows = zip(x_arr.tolist(), wavenumbers_arr.tolist(), y_arr.tolist())
+    else:
+        # 2-column format without calibration
+        rows = zip(x_arr.tolist(), y_arr.tolist())
+
+    # Write to a temporary file and move it into place, so that an interrupted write never
+    # leaves a partial CSV behind
+    file_path = Path(file_path)
+    temp_file_path = file_path.with_name(file_path.name + ".tmp")
+    try:
+        with open(temp_file_path, mode="w", newline="") as file:
+            writer = csv.writer(file)
+            # Write the header
+            writer.writerow(header)
+            # Write the data rows
+            writer.writerows(rows)
+        os.replace(temp_file_path, file_path)
+    except BaseException:
+        temp_file_path.unlink(missing_ok=True)
+        raise
 
 
 def extract_stage_positions(
@@ -99,6 +113,7 @@ def extract_stage_positions(
 
     Raises:
         FileNotFoundError: If the stage position file is not found
+        ValueError: If a device position does not have exactly two (X, Y) coordinates
     """
 
     print(f"Extracting stage positions from: {file_path}")
@@ -114,15 +129,21 @@ def extract_stage_positions(
     labels = []
 
     for position in stage_positions:
-        # Get the position array from DevicePositions
+        # Get the label and the position array from DevicePositions once per position
+        label = position["Label"]["scalar"]
         device_positions = position["DevicePositions"]["array"]
         for device in device_positions:
-            xy_position = device["Position_um"]["array"]
-            coordinates.append(xy_position)
-            labels.append(position["Label"]["scalar"])
+            coordinates.append(device["Position_um"]["array"])
+            labels.append(label)
 
-    # Convert coordinates to a numpy array of shape (N, 2) and labels to a numpy array
+    # Convert coordinates to a numpy array of shape (N, 2)
     coordinates_array = np.array(coordinates)
+    if coordinates_array.ndim != 2 or coordinates_array.shape[1] != 2:
+        raise ValueError(
+            f"Stage positions must be (X, Y) pairs, got an array of shape {coordinates_array.shape}"
+        )
+
+    # Convert labels to a numpy array
     labels = np.array(labels)
 
     if randomize_position_order: